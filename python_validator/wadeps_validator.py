@@ -5,35 +5,190 @@ Validates CSV files against WADEPS SmartForm Template requirements
 
 import json
 import csv
+import codecs
+import io
+import contextlib
 from pathlib import Path
-from typing import Dict, List, Any, Optional
+from typing import Dict, List, Any, Optional, Tuple, Mapping
+from types import MappingProxyType
 import re
 from datetime import datetime
+from itertools import islice
+from collections import defaultdict
+from functools import lru_cache
+from concurrent.futures import ProcessPoolExecutor
 import sys
 import os
 import argparse
 
+try:
+    import orjson
+except ImportError:
+    orjson = None
+
+
+# Error report categories and their fix hints, shared by every grouped error
+_CAT_DATE = sys.intern('Date Format Issues')
+_CAT_TIME = sys.intern('Time Format Issues')
+_CAT_DROPDOWN = sys.intern('Invalid Dropdown Values')
+_CAT_OTHER = sys.intern('Other Validation Issues')
+_FIX_DATE = sys.intern('Use format MM/DD/YYYY (e.g., 09/23/2025)')
+_FIX_TIME = sys.intern('Use format HH:MM (e.g., 08:21)')
+_FIX_DROPDOWN = sys.intern('Use exact value from dropdown list')
+_FIX_OTHER = sys.intern('Check validation requirements')
+
+_SUBJECT_INITIALS_RE = re.compile(r'^[A-Za-z]{1,4}$|^[A-Za-z](\.[A-Za-z])*\.?$')
+_UNKNOWN_SUBJECT_IDS = frozenset(['unknown', 'unk'])
+
+# Month and day spellings accepted in dates, with or without a leading zero
+_MONTHS = frozenset([str(m) for m in range(1, 13)] + [f"{m:02d}" for m in range(1, 10)])
+_DAYS = frozenset([str(d) for d in range(1, 32)] + [f"{d:02d}" for d in range(1, 10)])
+
+
+# Distinct values per column whose validation outcome is remembered while
+# reading one file; free-text columns stop being cached once they hit this.
+FIELD_CACHE_LIMIT = 1024
+
+# Errors/warnings kept per file; anything beyond this is only counted.
+MAX_ERRORS_REPORTED = 10_000
+
+# Read buffer for input CSVs; large files otherwise cost one syscall per 8 KiB.
+CSV_READ_BUFFER = 1 << 20
+
+# ProcessPoolExecutor rejects more than 61 workers on Windows.
+_MAX_WINDOWS_WORKERS = 61
+
+# Inline styles repeated across dashboard stat cards and header lists
+_STAT_CELL_STYLE = 'display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;'
+_STAT_TITLE_STYLE = 'margin: 0 0 5px 0; color: #333;'
+_STAT_NOTE_STYLE = 'font-size: 11px; color: #666;'
+_HEADER_ITEM_STYLE = 'margin-bottom: 2px; word-break: break-all;'
+
+
+def _classify_error(error_msg: str) -> str:
+    """Map a validation error message to its report category"""
+    lowered = error_msg.lower()
+    if 'date format' in lowered:
+        return _CAT_DATE
+    if 'time format' in lowered:
+        return _CAT_TIME
+    if 'Must be one of' in error_msg:
+        return _CAT_DROPDOWN
+    return _CAT_OTHER
+
+
+@lru_cache(maxsize=1024)
+def _describe_error(header: str, error_msg: str) -> Tuple[str, str, str]:
+    """Category, report key and fix hint for an error, formatted once per column/message"""
+    error_type = _classify_error(error_msg)
+    if error_type == _CAT_DATE:
+        return error_type, f"{header}: Date format issue", _FIX_DATE
+    if error_type == _CAT_TIME:
+        return error_type, f"{header}: Time format issue", _FIX_TIME
+    if error_type == _CAT_DROPDOWN:
+        return error_type, f"{header}: Invalid dropdown value", _FIX_DROPDOWN
+    return error_type, f"{header}: {error_msg[:30]}", _FIX_OTHER
+
+
+def _open_csv(csv_path: str) -> io.TextIOWrapper:
+    """Open a CSV as UTF-8 text, skipping a leading BOM once up front"""
+    raw = open(csv_path, 'rb', buffering=CSV_READ_BUFFER)
+    try:
+        if raw.peek(len(codecs.BOM_UTF8)).startswith(codecs.BOM_UTF8):
+            raw.read(len(codecs.BOM_UTF8))
+        return io.TextIOWrapper(raw, encoding='utf-8')
+    except BaseException:
+        raw.close()
+        raise
+
+
+def _is_valid_date(value: str) -> bool:
+    """Check for MM/DD/YYYY or YYYY-MM-DD (leading zeros optional) without a regex"""
+    parts = value.split('/')
+    if len(parts) == 3:
+        month, day, year = parts
+    else:
+        parts = value.split('-')
+        if len(parts) != 3:
+            return False
+        year, month, day = parts
+    return month in _MONTHS and day in _DAYS and len(year) == 4 and year.isdecimal()
+
+
+def _is_valid_time(value: str) -> bool:
+    """Check for HH:MM without a regex"""
+    return (len(value) == 5 and value[2] == ':'
+            and value[:2].isdecimal() and value[3:].isdecimal())
+
+
+def _freeze(value: Any) -> Any:
+    """Read-only copy of parsed JSON: dicts become mapping proxies, lists become tuples"""
+    if isinstance(value, dict):
+        return MappingProxyType({k: _freeze(v) for k, v in value.items()})
+    if isinstance(value, list):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+def _describe_format(fmt: Any) -> str:
+    """Render a rule's format as written in the template, even once frozen to a tuple"""
+    return str(list(fmt)) if isinstance(fmt, tuple) else str(fmt)
+
+
+@lru_cache(maxsize=4)
+def _load_template(path: str) -> Mapping[str, Any]:
+    """Parse a template once per path; frozen so validators can share it safely"""
+    with open(path, 'r') as f:
+        return _freeze(json.load(f))
+
+
+@lru_cache(maxsize=8)
+def _load_register(path: str) -> frozenset:
+    """Agency names and aliases from a register file, read once per path"""
+    with open(path, 'r') as f:
+        register_data = json.load(f)
+    valid_names = set()
+    for name, info in register_data.get('agencies', {}).items():
+        valid_names.add(name)
+        valid_names.update(info.get('aliases', []))
+    return frozenset(valid_names)
+
+
+def _write_json(path, data: Any, pretty: bool = False):
+    """Write data as JSON, using orjson when it is installed"""
+    if orjson is not None:
+        with open(path, 'wb') as f:
+            f.write(orjson.dumps(data, option=orjson.OPT_INDENT_2 if pretty else 0))
+    else:
+        with open(path, 'w') as f:
+            if pretty:
+                json.dump(data, f, indent=2)
+            else:
+                json.dump(data, f, separators=(',', ':'))
+
 
 class WADEPSValidator:
     """WADEPS data validation class"""
     
-    def __init__(self, template_path: str = None):
+    def __init__(self, template_path: str = None, max_errors: int = MAX_ERRORS_REPORTED):
         self.template_path = template_path or "../templates/wadeps_uof_template.json"
+        self.max_errors = max_errors
         self.headers = []
         self.validations = {}
-        self.register_lookups: Dict[str, set] = {}
+        self.header_set: frozenset = frozenset()
+        self.register_lookups: Dict[str, frozenset] = {}
+        self.pattern_lookups: Dict[str, re.Pattern] = {}
+        self.list_lookups: Dict[str, frozenset] = {}
+        self.yes_no_lookups: Dict[str, frozenset] = {}
+        self.number_bounds: Dict[str, tuple] = {}
         
-    def load_template_data(self) -> Dict[str, Any]:
+    def load_template_data(self) -> Mapping[str, Any]:
         """Load headers and validation rules from JSON template"""
         print(f"Reading template: {self.template_path}")
 
         try:
-            with open(self.template_path, 'r') as f:
-                data = json.load(f)
-
-            self.headers = data.get('headers', [])
-            self.validations = data.get('validations', {})
-            self._load_registers()
+            data = _load_template(self.template_path)
+            self._apply_template(data)
 
             print(f"{len(self.headers)} headers")
             print(f"{len(self.validations)} validation rules")
@@ -44,6 +199,13 @@ class WADEPSValidator:
             print(f"Error reading template: {e}")
             raise
     
+    def _apply_template(self, data: Mapping[str, Any]):
+        """Install headers and validation rules from parsed template data"""
+        self.headers = data.get('headers', [])
+        self.validations = data.get('validations', {})
+        self._load_registers()
+        self._prepare_rules()
+
 #template_based_validation
 
     def _load_registers(self):
@@ -56,19 +218,32 @@ class WADEPSValidator:
                     continue
                 register_path = template_dir / source
                 try:
-                    with open(register_path, 'r') as f:
-                        register_data = json.load(f)
-                    valid_names = set()
-                    for name, info in register_data.get('agencies', {}).items():
-                        valid_names.add(name)
-                        for alias in info.get('aliases', []):
-                            valid_names.add(alias)
+                    valid_names = _load_register(str(register_path))
                     self.register_lookups[field] = valid_names
                     print(f"  Register loaded for {field}: {len(valid_names)} valid values")
                 except FileNotFoundError:
                     print(f"  Warning: register file not found {register_path}")
                 except Exception as e:
                     print(f"  Warning: failed to load register for {field}: {e}")
+
+    def _prepare_rules(self):
+        """Precompute per-field lookups so row validation does no setup work"""
+        self.header_set = frozenset(self.headers)
+        self.pattern_lookups = {}
+        self.list_lookups = {}
+        self.yes_no_lookups = {}
+        self.number_bounds = {}
+        for field, rule in self.validations.items():
+            if rule.get('type') == 'pattern':
+                self.pattern_lookups[field] = re.compile(rule['pattern'])
+            elif rule.get('type') == 'list':
+                values = rule['values']
+                self.list_lookups[field] = frozenset(values)
+                if len(values) == 2 and 'Yes' in values and 'No' in values:
+                    self.yes_no_lookups[field] = frozenset(v.lower() for v in values)
+            elif rule.get('type') == 'number':
+                self.number_bounds[field] = (rule.get('min', float('-inf')),
+                                             rule.get('max', float('inf')))
     
     def validate_csv(self, csv_path: str) -> Dict[str, Any]:
         """Validate a CSV file against the template"""
@@ -86,6 +261,9 @@ class WADEPSValidator:
             'data_validation': {
                 'errors': [],
                 'warnings': [],
+                'error_tallies': [],
+                'error_count': 0,
+                'warning_count': 0,
                 'total_rows': 0
             },
             'subject_id_validation': {
@@ -97,17 +275,25 @@ class WADEPSValidator:
         }
         
         try:
-            with open(csv_path, 'r', encoding='utf-8-sig') as f:
-                reader = csv.DictReader(f)
-                csv_headers = reader.fieldnames
+            with _open_csv(csv_path) as f:
+                reader = csv.reader(f)
+                csv_headers = next(reader, None)
+                
+#empty_file
+                if csv_headers is None:
+                    results['header_validation']['missing'] = list(self.headers)
+                    print(f"  File is empty: no header row found")
+                    self._finalize(results)
+                    return results
                 
 #header_check
-                template_set = set(self.headers)
+                template_set = self.header_set
                 csv_set = set(csv_headers)
                 
-                results['header_validation']['matching'] = list(template_set & csv_set)
-                results['header_validation']['missing'] = list(template_set - csv_set)
-                results['header_validation']['extra'] = list(csv_set - template_set)
+#keep_template_and_file_order
+                results['header_validation']['matching'] = [h for h in self.headers if h in csv_set]
+                results['header_validation']['missing'] = [h for h in self.headers if h not in csv_set]
+                results['header_validation']['extra'] = [h for h in dict.fromkeys(csv_headers) if h not in template_set]
                 results['header_validation']['is_valid'] = len(results['header_validation']['missing']) == 0
                 
                 print(f"  Headers: {len(results['header_validation']['matching'])} matching, "
@@ -115,23 +301,54 @@ class WADEPSValidator:
                       f"{len(results['header_validation']['extra'])} extra")
                 
 #row_processing
-                for row_num, row in enumerate(reader, start=2):
+                col_index = {h: i for i, h in enumerate(csv_headers)}
+                validated_headers = [h for h in csv_headers if h in self.validations]
+                field_cache: Dict[str, Dict[str, Optional[Dict]]] = {h: {} for h in validated_headers}
+#uncapped_error_tallies_per_column_and_message
+                column_tallies: Dict[str, Dict[str, Dict]] = {h: {} for h in validated_headers}
+                error_tallies = results['data_validation']['error_tallies']
+                validated_cols = [(col_index[h], h, field_cache[h], column_tallies[h])
+                                  for h in validated_headers]
+                subject_col = col_index.get('subject_id')
+                
+#skip_blank_lines_like_dictreader
+                for row_num, row in enumerate((r for r in reader if r), start=2):
                     results['data_validation']['total_rows'] += 1
+                    row_len = len(row)
                     
 #field_validation
-                    for header in csv_headers:
-                        if header in self.validations:
-                            value = row.get(header, '')
-                            validation_result = self._validate_field(header, value, row_num)
-                            if validation_result:
-                                if validation_result['severity'] == 'error':
-                                    results['data_validation']['errors'].append(validation_result)
-                                else:
-                                    results['data_validation']['warnings'].append(validation_result)
+                    for col_i, header, cache, tallies in validated_cols:
+                        value = row[col_i] if col_i < row_len else ''
+                        if value in cache:
+                            issue = cache[value]
+                        else:
+                            issue = self._check_field(header, value)
+                            if len(cache) < FIELD_CACHE_LIMIT:
+                                cache[value] = issue
+                        if issue:
+                            if issue['severity'] == 'error':
+                                results['data_validation']['error_count'] += 1
+                                if len(results['data_validation']['errors']) < self.max_errors:
+                                    results['data_validation']['errors'].append({'row': row_num, **issue})
+                                tally = tallies.get(issue['error'])
+                                if tally is None:
+                                    tally = tallies[issue['error']] = {
+                                        'column': header,
+                                        'error': issue['error'],
+                                        'count': 0,
+                                        'example': issue.get('value', '')
+                                    }
+                                    error_tallies.append(tally)
+                                tally['count'] += 1
+                            else:
+                                results['data_validation']['warning_count'] += 1
+                                if len(results['data_validation']['warnings']) < self.max_errors:
+                                    results['data_validation']['warnings'].append({'row': row_num, **issue})
                     
 #special_validation_subject_id
-                    if 'subject_id' in row:
-                        subject_result = self._validate_subject_id(row['subject_id'], row_num)
+                    if subject_col is not None:
+                        subject_value = row[subject_col] if subject_col < row_len else ''
+                        subject_result = self._validate_subject_id(subject_value, row_num)
                         if subject_result:
                             if subject_result['type'] == 'unknown':
                                 results['subject_id_validation']['unknown_count'] += 1
@@ -144,14 +361,12 @@ class WADEPSValidator:
                                 results['subject_id_validation']['examples'].append(subject_result)
                 
                 print(f"  Validated {results['data_validation']['total_rows']} rows")
-                print(f"  {len(results['data_validation']['errors'])} errors, "
-                      f"{len(results['data_validation']['warnings'])} warnings")
+                print(f"  {results['data_validation']['error_count']} errors, "
+                      f"{results['data_validation']['warning_count']} warnings")
                 
-                subject_issues = (results['subject_id_validation']['unknown_count'] + 
-                                results['subject_id_validation']['name_count'] + 
-                                results['subject_id_validation']['invalid_count'])
-                if subject_issues > 0:
-                    print(f"  Subject ID issues: {subject_issues}")
+                summary = self._finalize(results)
+                if summary['subject_issues'] > 0:
+                    print(f"  Subject ID issues: {summary['subject_issues']}")
                 
         except Exception as e:
             print(f"  Error validating CSV: {e}")
@@ -159,138 +374,189 @@ class WADEPSValidator:
         
         return results
     
-    def _validate_field(self, header: str, value: str, row_num: int) -> Optional[Dict]:
-        """Validate a single field value"""
-        if not value or value.strip() == '':
+    def _finalize(self, results: Dict) -> Dict[str, Any]:
+        """Compute the counts and pass/fail verdict shared by every report output"""
+        hv = results.get('header_validation') or {}
+        dv = results.get('data_validation') or {}
+        sv = results.get('subject_id_validation') or {}
+        subject_issues = (sv.get('unknown_count', 0) + 
+                         sv.get('name_count', 0) + 
+                         sv.get('invalid_count', 0))
+#counts_fall_back_to_stored_lists_for_older_results
+        error_count = dv.get('error_count', len(dv.get('errors', [])))
+        
+        summary = {
+            'subject_issues': subject_issues,
+            'error_count': error_count,
+            'warning_count': dv.get('warning_count', len(dv.get('warnings', []))),
+            'is_passed': hv.get('is_valid', False) and error_count == 0 and subject_issues == 0,
+            'is_batch_passed': hv.get('is_valid', False) and error_count == 0,
+            'is_failed_critical': len(hv.get('missing', [])) > 0 or error_count > 10
+        }
+        results['summary'] = summary
+        return summary
+    
+    def _check_field(self, header: str, value: str) -> Optional[Dict]:
+        """Validate a field value independent of its row, so results can be reused"""
+        if not value:
+            return None
+        
+        value = value.strip()
+        if not value:
             return None
         
         rule = self.validations.get(header)
         if not rule:
             return None
         
-        value = value.strip()
+        checker = self._FIELD_CHECKERS.get(rule['type'])
+        if checker is None:
+            return None
         
+        return checker(self, header, rule, value)
+    
 #list_validation
-        if rule['type'] == 'list':
-            if value not in rule['values']:
+    def _check_list(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a dropdown value against the allowed values"""
+        allowed = self.list_lookups.get(header) or rule['values']
+        if value not in allowed:
 #yes_no_case_check
-                if len(rule['values']) == 2 and 'Yes' in rule['values'] and 'No' in rule['values']:
-                    if value.lower() not in [v.lower() for v in rule['values']]:
-                        return {
-                            'row': row_num,
-                            'column': header,
-                            'value': value,
-                            'error': f"Must be one of: {', '.join(rule['values'][:5])}{'...' if len(rule['values']) > 5 else ''}",
-                            'severity': 'error'
-                        }
-                else:
+            yes_no = self.yes_no_lookups.get(header)
+            if yes_no is not None:
+                if value.lower() not in yes_no:
                     return {
-                        'row': row_num,
                         'column': header,
                         'value': value,
                         'error': f"Must be one of: {', '.join(rule['values'][:5])}{'...' if len(rule['values']) > 5 else ''}",
                         'severity': 'error'
                     }
-        
-#date_validation
-        elif rule['type'] == 'date':
-            date_pattern_mmddyyyy = r'^(0?[1-9]|1[0-2])/(0?[1-9]|[12][0-9]|3[01])/\d{4}$'
-            date_pattern_yyyymmdd = r'^\d{4}-(0?[1-9]|1[0-2])-(0?[1-9]|[12][0-9]|3[01])$'
-            if not re.match(date_pattern_mmddyyyy, value) and not re.match(date_pattern_yyyymmdd, value):
+            else:
                 return {
-                    'row': row_num,
                     'column': header,
                     'value': value,
-                    'error': f"Invalid date format. Expected {rule.get('format', 'MM/DD/YYYY')}",
+                    'error': f"Must be one of: {', '.join(rule['values'][:5])}{'...' if len(rule['values']) > 5 else ''}",
                     'severity': 'error'
                 }
-        
+        return None
+    
+#date_validation
+    def _check_date(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a date value (MM/DD/YYYY or YYYY-MM-DD)"""
+        if not _is_valid_date(value):
+            return {
+                'column': header,
+                'value': value,
+                'error': f"Invalid date format. Expected {_describe_format(rule.get('format', 'MM/DD/YYYY'))}",
+                'severity': 'error'
+            }
+        return None
+    
 #time_validation
-        elif rule['type'] == 'time':
-            if not re.match(r'^\d{2}:\d{2}$', value):
-                return {
-                    'row': row_num,
-                    'column': header,
-                    'value': value,
-                    'error': f"Invalid time format. Expected {rule.get('format', 'HH:MM')}",
-                    'severity': 'error'
-                }
-        
+    def _check_time(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a time value (HH:MM)"""
+        if not _is_valid_time(value):
+            return {
+                'column': header,
+                'value': value,
+                'error': f"Invalid time format. Expected {_describe_format(rule.get('format', 'HH:MM'))}",
+                'severity': 'error'
+            }
+        return None
+    
 #number_validation
-        elif rule['type'] == 'number':
-            try:
-                num = float(value)
-                if 'min' in rule and num < rule['min']:
-                    return {
-                        'row': row_num,
-                        'column': header,
-                        'value': value,
-                        'error': f"Value must be >= {rule['min']}",
-                        'severity': 'error'
-                    }
-                if 'max' in rule and num > rule['max']:
-                    return {
-                        'row': row_num,
-                        'column': header,
-                        'value': value,
-                        'error': f"Value must be <= {rule['max']}",
-                        'severity': 'error'
-                    }
-            except ValueError:
+    def _check_number(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a numeric value and its optional min/max bounds"""
+        bounds = self.number_bounds.get(header)
+        if bounds is None:
+            bounds = (rule.get('min', float('-inf')), rule.get('max', float('inf')))
+        low, high = bounds
+        try:
+            num = float(value)
+            if low <= num <= high:
+                return None
+            if num < low:
                 return {
-                    'row': row_num,
                     'column': header,
                     'value': value,
-                    'error': "Must be a number",
+                    'error': f"Value must be >= {rule['min']}",
                     'severity': 'error'
                 }
-        
-#pattern_validation
-        elif rule['type'] == 'pattern':
-            if not re.match(rule['pattern'], value.upper()):
+            if num > high:
                 return {
-                    'row': row_num,
                     'column': header,
                     'value': value,
-                    'error': rule.get('description', f"Must match pattern: {rule['pattern']}"),
+                    'error': f"Value must be <= {rule['max']}",
                     'severity': 'error'
                 }
-        
+        except ValueError:
+            return {
+                'column': header,
+                'value': value,
+                'error': "Must be a number",
+                'severity': 'error'
+            }
+        return None
+    
+#pattern_validation
+    def _check_pattern(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a value against the rule's regex pattern"""
+        pattern = self.pattern_lookups.get(header) or re.compile(rule['pattern'])
+        if not pattern.match(value.upper()):
+            return {
+                'column': header,
+                'value': value,
+                'error': rule.get('description', f"Must match pattern: {rule['pattern']}"),
+                'severity': 'error'
+            }
+        return None
+    
 #text_validation
-        elif rule['type'] == 'text':
-            max_len = rule.get('maxLength')
-            if max_len and len(value) > max_len:
-                return {
-                    'row': row_num,
-                    'column': header,
-                    'value': value,
-                    'error': f"Exceeds max length of {max_len} characters ({len(value)} given)",
-                    'severity': 'error'
-                }
-        
+    def _check_text(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a free-text value against its max length"""
+        max_len = rule.get('maxLength')
+        if max_len and len(value) > max_len:
+            return {
+                'column': header,
+                'value': value,
+                'error': f"Exceeds max length of {max_len} characters ({len(value)} given)",
+                'severity': 'error'
+            }
+        return None
+    
 #register_validation
-        elif rule['type'] == 'register':
-            valid_set = self.register_lookups.get(header)
-            if valid_set and value not in valid_set:
-                return {
-                    'row': row_num,
-                    'column': header,
-                    'value': value,
-                    'error': "Not found in agency register",
-                    'severity': 'error'
-                }
-        
+    def _check_register(self, header: str, rule: Dict, value: str) -> Optional[Dict]:
+        """Check a value against the loaded agency register"""
+        valid_set = self.register_lookups.get(header)
+        if valid_set and value not in valid_set:
+            return {
+                'column': header,
+                'value': value,
+                'error': "Not found in agency register",
+                'severity': 'error'
+            }
         return None
     
+    _FIELD_CHECKERS = {
+        'list': _check_list,
+        'date': _check_date,
+        'time': _check_time,
+        'number': _check_number,
+        'pattern': _check_pattern,
+        'text': _check_text,
+        'register': _check_register,
+    }
+    
     def _validate_subject_id(self, value: str, row_num: int) -> Optional[Dict]:
         """Validate subject_id format"""
-        if not value or value.strip() == '':
+        if not value:
             return None
         
         val = value.strip()
+        if not val:
+            return None
         
 #unknown_check
-        if val.lower() in ['unknown', 'unk']:
+        if val.lower() in _UNKNOWN_SUBJECT_IDS:
             return {
                 'row': row_num,
                 'value': val,
@@ -298,6 +564,10 @@ class WADEPSValidator:
                 'error': 'Subject ID should not be "unknown"'
             }
         
+#initials_fast_path
+        if _SUBJECT_INITIALS_RE.match(val):
+            return None
+        
 #name_check
         if ' ' in val:
             parts = val.split()
@@ -309,16 +579,13 @@ class WADEPSValidator:
                     'error': 'Subject ID appears to be a full name. Use initials instead'
                 }
         
-#initials_check
-        if not re.match(r'^[A-Za-z]{1,4}$|^[A-Za-z](\.[A-Za-z])*\.?$', val):
-            return {
-                'row': row_num,
-                'value': val,
-                'type': 'invalid',
-                'error': 'Subject ID must be initials (e.g., "JD", "J.D.", "J.D.S")'
-            }
-        
-        return None
+#not_initials
+        return {
+            'row': row_num,
+            'value': val,
+            'type': 'invalid',
+            'error': 'Subject ID must be initials (e.g., "JD", "J.D.", "J.D.S")'
+        }
     
     def save_template_data(self, output_path: str = "../templates/wadeps_uof_template.json"):
         """Save extracted template data to JSON file"""
@@ -332,13 +599,13 @@ class WADEPSValidator:
         }
         
         with open(output_path, 'w') as f:
-            json.dump(template_data, f, indent=2)
+            json.dump(template_data, f, indent=2, default=dict)
         
         print(f"Template data saved to: {output_path}")
         return output_path
     
-    def save_validation_results(self, results: Dict, output_path: str = None):
-        """Save validation results to JSON file"""
+    def save_validation_results(self, results: Dict, output_path: str = None, pretty: bool = False):
+        """Save validation results to JSON file (compact unless pretty is set)"""
         if not output_path:
 #use_input_filename_as_base
             base_name = Path(results['file']).stem
@@ -348,8 +615,7 @@ class WADEPSValidator:
 #create_output_directory
         os.makedirs(os.path.dirname(output_path), exist_ok=True)
         
-        with open(output_path, 'w') as f:
-            json.dump(results, f, indent=2)
+        _write_json(output_path, results, pretty)
         
         print(f"  Results saved to: {output_path}")
         return output_path
@@ -359,20 +625,27 @@ class WADEPSValidator:
         base_name = Path(results['file']).stem
         dashboard_path = f"output/{base_name}_dashboard.html"
         
+#unpack_sections_once
+        hv = results.get('header_validation') or {}
+        dv = results.get('data_validation') or {}
+        sv = results.get('subject_id_validation') or {}
+        error_list = dv.get('errors') or []
+        warning_list = dv.get('warnings') or []
+        summary = results.get('summary') or self._finalize(results)
+        headers_valid = hv.get('is_valid', False)
+        generated_at = datetime.now().strftime('%Y-%m-%d %H:%M:%S')
+        
 #calculate_metrics
-        total_rows = results.get('data_validation', {}).get('total_rows', 0)
-        total_errors = len(results.get('data_validation', {}).get('errors', []))
-        total_warnings = len(results.get('data_validation', {}).get('warnings', []))
-        header_issues = len(results.get('header_validation', {}).get('missing', [])) + len(results.get('header_validation', {}).get('extra', []))
-        subject_issues = (results.get('subject_id_validation', {}).get('unknown_count', 0) + 
-                         results.get('subject_id_validation', {}).get('name_count', 0) + 
-                         results.get('subject_id_validation', {}).get('invalid_count', 0))
+        total_rows = dv.get('total_rows', 0)
+        total_errors = summary['error_count']
+        total_warnings = summary['warning_count']
+        header_issues = len(hv.get('missing', [])) + len(hv.get('extra', []))
+        subject_issues = summary['subject_issues']
         
         quality_score = max(0, 100 - (total_errors / max(total_rows, 1) * 100))
         
 #determine_status
-        hv = results.get('header_validation', {})
-        if not hv.get('is_valid', False) or total_errors > 0:
+        if not headers_valid or total_errors > 0:
             status = 'failed'
             status_color = '#e53e3e'
             status_text = 'Validation Failed'
@@ -385,7 +658,7 @@ class WADEPSValidator:
             status_color = '#48bb78'
             status_text = 'Validation Passed'
         
-        html_content = f"""<!DOCTYPE html>
+        parts = [f"""<!DOCTYPE html>
 <html lang="en">
 <head>
     <meta charset="UTF-8">
@@ -419,7 +692,7 @@ class WADEPSValidator:
     <div class="container">
         <div class="header">
             <h1>WADEPS Validation Results</h1>
-            <p>File: {results['file']} | Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}</p>
+            <p>File: {results['file']} | Generated: {generated_at}</p>
             <span class="status-badge">{status_text}</span>
         </div>
         
@@ -431,7 +704,7 @@ class WADEPSValidator:
                  </div>
                  <div class="stat-card">
                      <h3>Headers Match</h3>
-                     <div class="value" style="color: {'#48bb78' if hv.get('is_valid', False) else '#e53e3e'};">{'Yes' if hv.get('is_valid', False) else 'No'}</div>
+                     <div class="value" style="color: {'#48bb78' if headers_valid else '#e53e3e'};">{'Yes' if headers_valid else 'No'}</div>
                  </div>
                  <div class="stat-card">
                      <h3>Data Errors</h3>
@@ -442,71 +715,73 @@ class WADEPSValidator:
                      <div class="value" style="color: {'#48bb78' if subject_issues == 0 else '#e53e3e'};">{subject_issues}</div>
                  </div>
              </div>
-         </div>"""
+         </div>"""]
         
 #add_header_validation_section
-        html_content += f"""
+        parts.append(f"""
         <div class="panel">
             <h2>Header Validation</h2>
             <p style="color: #666; margin-bottom: 15px;">Your CSV file's column headers are compared against the WADEPS template requirements. Headers must match exactly (including spelling, spacing, and capitalization).</p>
             <div style="display: table; width: 100%;">
                 <div style="display: table-row;">
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Matching Headers</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Matching Headers</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #48bb78;">{len(hv.get('matching', []))}</div>
-                        <div style="font-size: 11px; color: #666;">Correct headers</div>
+                        <div style="{_STAT_NOTE_STYLE}">Correct headers</div>
                     </div>
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Missing Headers</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Missing Headers</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #e53e3e;">{len(hv.get('missing', []))}</div>
-                        <div style="font-size: 11px; color: #666;">Need to add</div>
+                        <div style="{_STAT_NOTE_STYLE}">Need to add</div>
                     </div>
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Extra Headers</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Extra Headers</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #dd6b20;">{len(hv.get('extra', []))}</div>
-                        <div style="font-size: 11px; color: #666;">Need to remove</div>
+                        <div style="{_STAT_NOTE_STYLE}">Need to remove</div>
                     </div>
                 </div>
-            </div>"""
+            </div>""")
         
         if hv.get('missing'):
-            html_content += f"""
+            parts.append(f"""
             <h3 style="margin: 15px 0 10px 0; color: #e53e3e;">Missing Required Headers ({len(hv['missing'])}):</h3>
             <div style="background: #fef5f5; padding: 10px; border-left: 3px solid #e53e3e; margin-bottom: 10px;">
                 <p style="margin: 0 0 10px 0; color: #666; font-size: 14px;"><strong>Action Required:</strong> Add these column headers to your CSV file.</p>
                 <div style="max-height: 200px; overflow-y: auto; border: 1px solid #e53e3e; background: white; padding: 10px;">
-                    <ul style="margin: 0; padding-left: 20px; font-family: monospace; font-size: 12px;">"""
-            for header in hv['missing'][:15]:
+                    <ul style="margin: 0; padding-left: 20px; font-family: monospace; font-size: 12px;">""")
 #truncate_long_headers
-                display_header = header if len(header) <= 60 else header[:57] + "..."
-                html_content += f'<li style="margin-bottom: 2px; word-break: break-all;">{display_header}</li>'
+            parts.extend(
+                f'<li style="{_HEADER_ITEM_STYLE}">{h if len(h) <= 60 else h[:57] + "..."}</li>'
+                for h in islice(hv['missing'], 15)
+            )
             if len(hv['missing']) > 15:
-                html_content += f'<li style="color: #666; font-style: italic;">... and {len(hv["missing"]) - 15} more headers</li>'
-            html_content += """</ul>
+                parts.append(f'<li style="color: #666; font-style: italic;">... and {len(hv["missing"]) - 15} more headers</li>')
+            parts.append("""</ul>
                 </div>
                 <p style="margin: 10px 0 0 0; color: #666; font-size: 12px;"><strong>Tip:</strong> Copy these exact header names into your CSV file's first row.</p>
-            </div>"""
+            </div>""")
         
         if hv.get('extra'):
-            html_content += f"""
+            parts.append(f"""
             <h3 style="margin: 15px 0 10px 0; color: #dd6b20;">Extra Headers ({len(hv['extra'])}):</h3>
             <div style="background: #fffaf0; padding: 10px; border-left: 3px solid #dd6b20; margin-bottom: 10px;">
                 <p style="margin: 0 0 10px 0; color: #666; font-size: 14px;"><strong>Action Required:</strong> Remove these column headers from your CSV file or rename them to match the template.</p>
                 <div style="max-height: 200px; overflow-y: auto; border: 1px solid #dd6b20; background: white; padding: 10px;">
-                    <ul style="margin: 0; padding-left: 20px; font-family: monospace; font-size: 12px;">"""
-            for header in hv['extra'][:15]:
-                display_header = header if len(header) <= 60 else header[:57] + "..."
-                html_content += f'<li style="margin-bottom: 2px; word-break: break-all;">{display_header}</li>'
+                    <ul style="margin: 0; padding-left: 20px; font-family: monospace; font-size: 12px;">""")
+            parts.extend(
+                f'<li style="{_HEADER_ITEM_STYLE}">{h if len(h) <= 60 else h[:57] + "..."}</li>'
+                for h in islice(hv['extra'], 15)
+            )
             if len(hv['extra']) > 15:
-                html_content += f'<li style="color: #666; font-style: italic;">... and {len(hv["extra"]) - 15} more headers</li>'
-            html_content += """</ul>
+                parts.append(f'<li style="color: #666; font-style: italic;">... and {len(hv["extra"]) - 15} more headers</li>')
+            parts.append("""</ul>
                 </div>
                 <p style="margin: 10px 0 0 0; color: #666; font-size: 12px;"><strong>Tip:</strong> These headers don't match the template. Check for typos, remove unnecessary columns, or check for hidden newline characters in your header row.</p>
-            </div>"""
+            </div>""")
         
 #add_quick_fix_guide
         if hv.get('missing') or hv.get('extra'):
-            html_content += """
+            parts.append("""
             <div style="background: #e6f3ff; padding: 15px; margin-top: 15px; border: 1px solid #b3d9ff;">
                 <h3 style="margin: 0 0 10px 0; color: #0066cc;">Quick Fix Guide for Header Issues:</h3>
                 <ol style="margin: 0; padding-left: 20px; color: #333;">
@@ -516,96 +791,98 @@ class WADEPSValidator:
                     <li><strong>Save your file</strong> and run the validator again</li>
                 </ol>
                 <p style="margin: 10px 0 0 0; color: #666; font-size: 12px;"><strong>Note:</strong> Header names are case-sensitive and must match exactly, including spaces and punctuation.</p>
-            </div>"""
+            </div>""")
         
-        html_content += "</div>"
+        parts.append("</div>")
         
 #add_errors_section
         if total_errors > 0:
-            html_content += f"""
+            parts.append(f"""
         <div class="panel">
             <h2>Data Validation Errors ({total_errors})</h2>
-            <p style="color: #666; margin-bottom: 15px;">These errors prevent your data from being accepted. Each error shows the column, row, and what needs to be fixed.</p>"""
+            <p style="color: #666; margin-bottom: 15px;">These errors prevent your data from being accepted. Each error shows the column, row, and what needs to be fixed.</p>""")
             
-#group_errors_by_type
-            error_types = self._group_errors_by_type(results.get('data_validation', {}).get('errors', []))
+#count_errors_by_type
+            error_types = self._count_errors_by_type(self._error_tallies(dv))
             
 #show_error_summary
-            html_content += """
+            parts.append("""
             <div style="background: #f8f9fa; padding: 10px; margin-bottom: 15px; border: 1px solid #dee2e6;">
-                <h3 style="margin: 0 0 10px 0; color: #333;">Error Summary:</h3>"""
-            for error_type, errors in error_types.items():
-                html_content += f'<div style="margin-bottom: 5px;"><strong>{error_type}:</strong> {len(errors)} errors</div>'
-            html_content += "</div>"
+                <h3 style="margin: 0 0 10px 0; color: #333;">Error Summary:</h3>""")
+            parts.extend(
+                f'<div style="margin-bottom: 5px;"><strong>{error_type}:</strong> {count} errors</div>'
+                for error_type, count in error_types.items()
+            )
+            parts.append("</div>")
             
 #show_detailed_errors
-            for error in results.get('data_validation', {}).get('errors', [])[:20]:
-                html_content += f"""
+            parts.extend(f"""
             <div class="error-item">
                 <h4>{error.get('column', 'Unknown')}</h4>
                 <p>{error.get('error', '')}</p>
                 <div class="meta">Row {error.get('row', '?')} | Value: &quot;{error.get('value', '')}&quot;</div>
-            </div>"""
-            if total_errors > 20:
-                html_content += f'<p style="color: #666; font-style: italic;">... and {total_errors - 20} more errors (see JSON file for complete list)</p>'
-            html_content += "</div>"
+            </div>""" for error in islice(error_list, 20))
+            shown = min(len(error_list), 20)
+            if total_errors > shown:
+                parts.append(f'<p style="color: #666; font-style: italic;">... and {total_errors - shown} more errors (see JSON file for complete list)</p>')
+            parts.append("</div>")
         
 #add_warnings_section
         if total_warnings > 0:
-            html_content += f"""
+            parts.append(f"""
         <div class="panel">
-            <h2>Warnings ({total_warnings})</h2>"""
-            for warning in results.get('data_validation', {}).get('warnings', []):
-                html_content += f"""
+            <h2>Warnings ({total_warnings})</h2>""")
+            parts.extend(f"""
             <div class="warning-item">
                 <h4>{warning.get('column', 'Unknown')}</h4>
                 <p>{warning.get('error', '')}</p>
                 <div class="meta">Row {warning.get('row', '?')} | Value: "{warning.get('value', '')}"</div>
-            </div>"""
-            html_content += "</div>"
+            </div>""" for warning in islice(warning_list, 20))
+            shown = min(len(warning_list), 20)
+            if total_warnings > shown:
+                parts.append(f'<p style="color: #666; font-style: italic;">... and {total_warnings - shown} more warnings (see JSON file for complete list)</p>')
+            parts.append("</div>")
         
         
 #add_subject_id_issues
         if subject_issues > 0:
-            sv = results.get('subject_id_validation', {})
-            html_content += f"""
+            parts.append(f"""
         <div class="panel">
             <h2>Subject ID Validation Issues ({subject_issues})</h2>
             <p style="color: #666; margin-bottom: 15px;">Subject IDs should be initials only (e.g., "JD", "J.D.", "J.D.S"). Full names and "unknown" values are not allowed.</p>
             
             <div style="display: table; width: 100%; margin-bottom: 15px;">
                 <div style="display: table-row;">
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Unknown Values</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Unknown Values</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #e53e3e;">{sv.get('unknown_count', 0)}</div>
-                        <div style="font-size: 11px; color: #666;">"unknown", "unk"</div>
+                        <div style="{_STAT_NOTE_STYLE}">"unknown", "unk"</div>
                     </div>
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Full Names</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Full Names</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #e53e3e;">{sv.get('name_count', 0)}</div>
-                        <div style="font-size: 11px; color: #666;">"John Doe"</div>
+                        <div style="{_STAT_NOTE_STYLE}">"John Doe"</div>
                     </div>
-                    <div style="display: table-cell; width: 33%; padding: 10px; text-align: center; border: 1px solid #ddd;">
-                        <h3 style="margin: 0 0 5px 0; color: #333;">Invalid Format</h3>
+                    <div style="{_STAT_CELL_STYLE}">
+                        <h3 style="{_STAT_TITLE_STYLE}">Invalid Format</h3>
                         <div style="font-size: 1.5em; font-weight: bold; color: #e53e3e;">{sv.get('invalid_count', 0)}</div>
-                        <div style="font-size: 11px; color: #666;">Numbers, symbols</div>
+                        <div style="{_STAT_NOTE_STYLE}">Numbers, symbols</div>
                     </div>
                 </div>
-            </div>"""
+            </div>""")
             
             if sv.get('examples'):
-                html_content += """
+                parts.append("""
                 <h3 style="margin: 15px 0 10px 0; color: #333;">Examples of Issues Found:</h3>
-                <div style="background: #fef5f5; padding: 10px; border-left: 3px solid #e53e3e;">"""
-                for example in sv['examples'][:5]:
-                    html_content += f"""
+                <div style="background: #fef5f5; padding: 10px; border-left: 3px solid #e53e3e;">""")
+                parts.extend(f"""
                     <div style="margin-bottom: 8px; padding: 5px; background: white; border: 1px solid #e53e3e;">
                         <strong>Row {example.get('row', '?')}:</strong> &quot;{example.get('value', '')}&quot; 
                         <span style="color: #666;">- {example.get('error', '')}</span>
-                    </div>"""
-                html_content += "</div>"
+                    </div>""" for example in islice(sv['examples'], 5))
+                parts.append("</div>")
             
-            html_content += """
+            parts.append("""
             <div style="background: #ebf8ff; padding: 10px; margin-top: 15px; border: 1px solid #bee3f8;">
                 <h3 style="margin: 0 0 10px 0; color: #2b6cb0;">How to Fix Subject ID Issues:</h3>
                 <ul style="margin: 0; padding-left: 20px;">
@@ -615,11 +892,11 @@ class WADEPSValidator:
                     <li>Examples: "JD", "J.D.", "J.D.S", "AB"</li>
                 </ul>
             </div>
-        </div>"""
+        </div>""")
         
 #add_success_section
-        if hv.get('is_valid', False) and total_errors == 0 and subject_issues == 0:
-            html_content += """
+        if summary['is_passed']:
+            parts.append("""
         <div class="panel" style="background: #f0fff4; border: 1px solid #9ae6b4;">
             <h2 style="color: #22543d;">Validation Passed!</h2>
             <p style="color: #22543d; margin-bottom: 15px;">Your CSV file meets all WADEPS requirements and is ready for submission.</p>
@@ -632,249 +909,290 @@ class WADEPSValidator:
                     <li>No critical validation errors found</li>
                 </ul>
             </div>
-        </div>"""
+        </div>""")
         
 #add_recommendations
-        html_content += """
+        parts.append("""
         <div class="recommendations">
             <h3>Recommendations</h3>
-            <ul>"""
+            <ul>""")
         
-        if not hv.get('is_valid', False):
-            html_content += "<li>Fix missing headers before resubmission</li>"
+        if not headers_valid:
+            parts.append("<li>Fix missing headers before resubmission</li>")
         if total_errors > 0:
-            html_content += f"<li>Address {total_errors} critical validation errors</li>"
+            parts.append(f"<li>Address {total_errors} critical validation errors</li>")
         if total_warnings > 0:
-            html_content += f"<li>Review {total_warnings} warnings for data quality</li>"
+            parts.append(f"<li>Review {total_warnings} warnings for data quality</li>")
         if subject_issues > 0:
-            html_content += f"<li>Fix {subject_issues} subject ID format issues</li>"
+            parts.append(f"<li>Fix {subject_issues} subject ID format issues</li>")
         
-        if hv.get('is_valid', False) and total_errors == 0 and subject_issues == 0:
-            html_content += "<li>File is ready for submission!</li>"
+        if summary['is_passed']:
+            parts.append("<li>File is ready for submission!</li>")
         
-        html_content += """
+        parts.append("""
             </ul>
         </div>
     </div>
 </body>
-</html>"""
+</html>""")
         
 #save_dashboard
         os.makedirs(os.path.dirname(dashboard_path), exist_ok=True)
-        with open(dashboard_path, 'w', encoding='utf-8') as f:
-            f.write(html_content)
+        Path(dashboard_path).write_bytes(''.join(parts).encode('utf-8'))
         
         print(f"  Dashboard saved to: {dashboard_path}")
         return dashboard_path
     
     def _group_errors_by_type(self, errors: List[Dict]) -> Dict[str, List[Dict]]:
         """Group errors by type for consistent error categorization"""
-        error_types = {}
+        error_types = defaultdict(list)
         for error in errors:
-            error_msg = error.get('error', '')
-            if 'date format' in error_msg.lower():
-                error_type = 'Date Format Issues'
-            elif 'time format' in error_msg.lower():
-                error_type = 'Time Format Issues'
-            elif 'Must be one of' in error_msg:
-                error_type = 'Invalid Dropdown Values'
-            else:
-                error_type = 'Other Validation Issues'
-            
-            if error_type not in error_types:
-                error_types[error_type] = []
-            error_types[error_type].append(error)
+            error_types[_classify_error(error.get('error', ''))].append(error)
+        
+        return dict(error_types)
+    
+    def _count_errors_by_type(self, error_tallies: List[Dict]) -> Dict[str, int]:
+        """Total error tallies per type, in order of first appearance"""
+        error_counts = defaultdict(int)
+        for tally in error_tallies:
+            error_counts[_classify_error(tally['error'])] += tally['count']
         
-        return error_types
+        return dict(error_counts)
+    
+    def _error_tallies(self, data_validation: Dict) -> List[Dict]:
+        """Uncapped per-column/message error counts, rebuilt from the stored errors if absent"""
+        if 'error_tallies' in data_validation:
+            return data_validation['error_tallies']
+        tallies: Dict[Tuple[str, str], Dict] = {}
+        for error in data_validation.get('errors', []):
+            column, message = error.get('column', 'Unknown'), error.get('error', '')
+            tally = tallies.get((column, message))
+            if tally is None:
+                tally = tallies[column, message] = {
+                    'column': column, 'error': message, 'count': 0,
+                    'example': error.get('value', '')
+                }
+            tally['count'] += 1
+        return list(tallies.values())
 
     def generate_error_report(self, results: Dict) -> str:
         """Generate a detailed error report"""
-        report = []
-        report.append("WADEPS VALIDATION ERROR REPORT")
-        report.append("=" * 60)
-        report.append(f"File: {results.get('file', 'Unknown')}")
-        report.append(f"Date: {results.get('timestamp', '')[:19]}")
-        report.append("")
+        buf = io.StringIO()
+        self.write_error_report(results, buf)
+#drop_trailing_newline
+        return buf.getvalue()[:-1]
+    
+    def write_error_report(self, results: Dict, fileobj):
+        """Write the detailed error report straight into an open text file"""
+        write = fileobj.write
+        write("WADEPS VALIDATION ERROR REPORT\n")
+        write("=" * 60 + "\n")
+        write(f"File: {results.get('file', 'Unknown')}\n")
+        write(f"Date: {results.get('timestamp', '')[:19]}\n")
+        write("\n")
         
 #header_issues
         headers = results.get('header_validation', {})
         if headers.get('missing'):
-            report.append("MISSING HEADERS:")
-            for h in headers['missing'][:10]:
-                report.append(f"  - {h}")
+            write("MISSING HEADERS:\n")
+            write(''.join(f"  - {h}\n" for h in islice(headers['missing'], 10)))
             if len(headers['missing']) > 10:
-                report.append(f"  ... and {len(headers['missing']) - 10} more")
-            report.append("")
+                write(f"  ... and {len(headers['missing']) - 10} more\n")
+            write("\n")
         
         if headers.get('extra'):
-            report.append("EXTRA/MALFORMED HEADERS:")
-            for h in headers['extra'][:10]:
-                if '\n' in h or '\r' in h:
-                    report.append(f"  - Header has line break: {repr(h)[:50]}")
-                else:
-                    report.append(f"  - {h}")
-            report.append("  FIX: Remove line breaks from header row")
-            report.append("")
+            write("EXTRA/MALFORMED HEADERS:\n")
+            write(''.join(f"  - Header has line break: {repr(h)[:50]}\n"
+                          if '\n' in h or '\r' in h else f"  - {h}\n"
+                          for h in islice(headers['extra'], 10)))
+            write("  FIX: Remove line breaks from header row\n")
+            write("\n")
         
 #data_validation_errors
         data_val = results.get('data_validation', {})
-        if data_val.get('errors'):
-            errors = data_val['errors']
-            
-#group_errors_by_type
-            error_types = self._group_errors_by_type(errors)
+        summary = results.get('summary') or self._finalize(results)
+        if summary['error_count']:
             
-            # Convert to detailed format for report
+#group_and_count_in_one_pass
+            # category_rank keeps equal counts listed by category, in order of first appearance
+            category_rank: Dict[str, int] = {}
+            key_rank: Dict[str, int] = {}
             detailed_error_types = {}
-            for error_type, error_list in error_types.items():
-                for error in error_list:
-                    header = error.get('column', 'Unknown')
-                    value = error.get('value', '')
-                    
-                    if 'Date Format' in error_type:
-                        key = f"{header}: Date format issue"
-                        fix = 'Use format MM/DD/YYYY (e.g., 09/23/2025)'
-                    elif 'Time Format' in error_type:
-                        key = f"{header}: Time format issue"
-                        fix = 'Use format HH:MM (e.g., 08:21)'
-                    elif 'Dropdown' in error_type:
-                        key = f"{header}: Invalid dropdown value"
-                        fix = 'Use exact value from dropdown list'
-                    else:
-                        key = f"{header}: {error.get('error', '')[:30]}"
-                        fix = 'Check validation requirements'
-                    
-                    if key not in detailed_error_types:
-                        detailed_error_types[key] = {
-                            'count': 0,
-                            'example': value,
-                            'fix': fix
-                        }
-                    
-                    detailed_error_types[key]['count'] += 1
-            
-            error_types = detailed_error_types
+            for tally in self._error_tallies(data_val):
+                error_type, key, fix = _describe_error(tally['column'], tally['error'])
+                entry = detailed_error_types.get(key)
+                if entry is None:
+                    detailed_error_types[key] = {
+                        'count': tally['count'],
+                        'example': tally['example'],
+                        'fix': fix
+                    }
+                    key_rank[key] = category_rank.setdefault(error_type, len(category_rank))
+                else:
+                    entry['count'] += tally['count']
             
-            report.append("DATA VALIDATION ISSUES:")
-            for error_type, info in sorted(error_types.items(), key=lambda x: -x[1]['count']):
-                report.append(f"  {info['count']:3d} × {error_type}")
-                report.append(f"       Example: \"{info['example']}\"")
-                report.append(f"       Fix: {info['fix']}")
-            report.append("")
+            write("DATA VALIDATION ISSUES:\n")
+            for error_type, info in sorted(detailed_error_types.items(),
+                                           key=lambda x: (-x[1]['count'], key_rank[x[0]])):
+                write(f"  {info['count']:3d} × {error_type}\n"
+                      f"       Example: \"{info['example']}\"\n"
+                      f"       Fix: {info['fix']}\n")
+            write("\n")
         
 #overall_status
-        report.append("VALIDATION STATUS:")
-        status = results.get('status', 'UNKNOWN')
-        if status == 'PASSED':
-            report.append("  PASSED - No critical issues")
+        write("VALIDATION STATUS:\n")
+        if summary['is_passed']:
+            write("  PASSED - No critical issues\n")
         else:
-            report.append("  FAILED - Issues must be fixed before submission")
-        
-        return "\n".join(report)
+            write("  FAILED - Issues must be fixed before submission\n")
     
     def print_summary(self, results: Dict):
         """Print a summary of validation results"""
-        print(f"\n  Summary for {results['file']}:")
+        lines: List[str] = []
+        lines.append(f"\n  Summary for {results['file']}:")
         
 #header_validation
         hv = results['header_validation']
         if len(hv['missing']) > 0:
-            print(f"    Missing {len(hv['missing'])} required headers")
+            lines.append(f"    Missing {len(hv['missing'])} required headers")
         
 #data_validation
-        dv = results['data_validation']
-        if len(dv['errors']) > 0:
-            print(f"    {len(dv['errors'])} data errors found")
+        summary = results.get('summary') or self._finalize(results)
+        if summary['error_count'] > 0:
+            lines.append(f"    {summary['error_count']} data errors found")
         
 #subject_id_validation
-        sv = results['subject_id_validation']
-        total_issues = sv['unknown_count'] + sv['name_count'] + sv['invalid_count']
-        if total_issues > 0:
-            print(f"    {total_issues} subject ID issues")
+        if summary['subject_issues'] > 0:
+            lines.append(f"    {summary['subject_issues']} subject ID issues")
         
 #overall_status
-        if hv['is_valid'] and len(dv['errors']) == 0 and total_issues == 0:
-            print(f"    PASSED - File meets all requirements")
-        elif len(hv['missing']) > 0 or len(dv['errors']) > 10:
-            print(f"    FAILED - Critical issues found")
+        if summary['is_passed']:
+            lines.append(f"    PASSED - File meets all requirements")
+        elif summary['is_failed_critical']:
+            lines.append(f"    FAILED - Critical issues found")
         else:
-            print(f"    PASSED WITH WARNINGS")
+            lines.append(f"    PASSED WITH WARNINGS")
+        
+        sys.stdout.write("\n".join(lines) + "\n")
     
     def print_detailed_results(self, results: Dict):
         """Print detailed validation results with formatting"""
-        print(f"\n{'='*60}")
-        print(f"DETAILED VALIDATION RESULTS: {results['file']}")
-        print(f"{'='*60}")
+        lines: List[str] = []
+        lines.append(f"\n{'='*60}")
+        lines.append(f"DETAILED VALIDATION RESULTS: {results['file']}")
+        lines.append(f"{'='*60}")
         
 #header_issues
         hv = results['header_validation']
         if hv['missing'] or hv['extra']:
-            print(f"\nHEADER VALIDATION:")
+            lines.append(f"\nHEADER VALIDATION:")
             if hv['missing']:
-                print(f"  Missing headers ({len(hv['missing'])}):")
-                for header in hv['missing'][:10]:
-                    print(f"    - {header}")
+                lines.append(f"  Missing headers ({len(hv['missing'])}):")
+                lines.extend(f"    - {header}" for header in islice(hv['missing'], 10))
                 if len(hv['missing']) > 10:
-                    print(f"    ... and {len(hv['missing']) - 10} more")
+                    lines.append(f"    ... and {len(hv['missing']) - 10} more")
             
             if hv['extra']:
-                print(f"  Extra headers ({len(hv['extra'])}):")
-                for header in hv['extra'][:10]:
-                    print(f"    + {header}")
+                lines.append(f"  Extra headers ({len(hv['extra'])}):")
+                lines.extend(f"    + {header}" for header in islice(hv['extra'], 10))
                 if len(hv['extra']) > 10:
-                    print(f"    ... and {len(hv['extra']) - 10} more")
+                    lines.append(f"    ... and {len(hv['extra']) - 10} more")
         
 #data_errors
         dv = results['data_validation']
-        if dv['errors']:
-            print(f"\nDATA VALIDATION ERRORS ({len(dv['errors'])}):")
-            for error in dv['errors'][:20]:
-                print(f"  Row {error['row']}, {error['column']}: {error['error']}")
+        summary = results.get('summary') or self._finalize(results)
+        error_count = summary['error_count']
+        warning_count = summary['warning_count']
+        if error_count:
+            lines.append(f"\nDATA VALIDATION ERRORS ({error_count}):")
+            for error in islice(dv['errors'], 20):
+                lines.append(f"  Row {error['row']}, {error['column']}: {error['error']}")
                 if error.get('value'):
-                    print(f"    Value: \"{error['value']}\"")
-            if len(dv['errors']) > 20:
-                print(f"  ... and {len(dv['errors']) - 20} more errors")
+                    lines.append(f"    Value: \"{error['value']}\"")
+            shown = min(len(dv['errors']), 20)
+            if error_count > shown:
+                lines.append(f"  ... and {error_count - shown} more errors")
         
 #warnings
-        if dv['warnings']:
-            print(f"\nWARNINGS ({len(dv['warnings'])}):")
-            for warning in dv['warnings'][:10]:
-                print(f"  Row {warning['row']}, {warning['column']}: {warning['error']}")
-            if len(dv['warnings']) > 10:
-                print(f"  ... and {len(dv['warnings']) - 10} more warnings")
+        if warning_count:
+            lines.append(f"\nWARNINGS ({warning_count}):")
+            lines.extend(f"  Row {warning['row']}, {warning['column']}: {warning['error']}"
+                         for warning in islice(dv['warnings'], 10))
+            shown = min(len(dv['warnings']), 10)
+            if warning_count > shown:
+                lines.append(f"  ... and {warning_count - shown} more warnings")
         
 #subject_id_issues
         sv = results['subject_id_validation']
-        total_subject_issues = sv['unknown_count'] + sv['name_count'] + sv['invalid_count']
+        total_subject_issues = summary['subject_issues']
         if total_subject_issues > 0:
-            print(f"\nSUBJECT ID ISSUES ({total_subject_issues}):")
-            print(f"  Unknown values: {sv['unknown_count']}")
-            print(f"  Full names: {sv['name_count']}")
-            print(f"  Invalid format: {sv['invalid_count']}")
+            lines.append(f"\nSUBJECT ID ISSUES ({total_subject_issues}):")
+            lines.append(f"  Unknown values: {sv['unknown_count']}")
+            lines.append(f"  Full names: {sv['name_count']}")
+            lines.append(f"  Invalid format: {sv['invalid_count']}")
             
             if sv['examples']:
-                print(f"  Examples:")
-                for example in sv['examples'][:5]:
-                    print(f"    Row {example['row']}: \"{example['value']}\" - {example['error']}")
+                lines.append(f"  Examples:")
+                lines.extend(f"    Row {example['row']}: \"{example['value']}\" - {example['error']}"
+                             for example in islice(sv['examples'], 5))
         
 #recommendations
-        print(f"\nRECOMMENDATIONS:")
+        lines.append(f"\nRECOMMENDATIONS:")
         if not hv['is_valid']:
-            print(f"  - Fix missing headers before resubmission")
-        if dv['errors']:
-            print(f"  - Address {len(dv['errors'])} critical validation errors")
-        if dv['warnings']:
-            print(f"  - Review {len(dv['warnings'])} warnings for data quality")
+            lines.append(f"  - Fix missing headers before resubmission")
+        if error_count:
+            lines.append(f"  - Address {error_count} critical validation errors")
+        if warning_count:
+            lines.append(f"  - Review {warning_count} warnings for data quality")
         if total_subject_issues > 0:
-            print(f"  - Fix {total_subject_issues} subject ID format issues")
+            lines.append(f"  - Fix {total_subject_issues} subject ID format issues")
         
-        if hv['is_valid'] and not dv['errors'] and total_subject_issues == 0:
-            print(f"  - ✅ File is ready for submission!")
+        if summary['is_passed']:
+            lines.append(f"  - ✅ File is ready for submission!")
         
-        print(f"\n{'='*60}")
+        lines.append(f"\n{'='*60}")
+
+        sys.stdout.write("\n".join(lines) + "\n")
+
+
+# Validator built once per batch worker process by _init_worker
+_worker_validator: Optional[WADEPSValidator] = None
 
 
-def process_auto_mode():
+def _init_worker(template_bytes: bytes, template_path: str):
+    """Parse the template and prepare its rules once when a worker process starts"""
+    global _worker_validator
+    with contextlib.redirect_stdout(io.StringIO()):
+        _worker_validator = WADEPSValidator(template_path)
+        _worker_validator._apply_template(json.loads(template_bytes))
+
+
+def _process_one(csv_path: str, output_folder: str,
+                 summary_only: bool = False) -> Tuple[str, Optional[Dict[str, Any]]]:
+    """Validate one CSV in a worker process; returns its captured output and a file summary"""
+    validator = _worker_validator
+    log = io.StringIO()
+    with contextlib.redirect_stdout(log):
+        try:
+            results = validator.validate_csv(csv_path)
+            output_path = Path(output_folder) / f"{Path(csv_path).stem}_validation.json"
+            validator.save_validation_results(results, str(output_path))
+            validator.generate_dashboard(results)
+            if summary_only:
+                validator.print_summary(results)
+            else:
+                validator.print_detailed_results(results)
+        except Exception as e:
+            print(f"  Error processing {Path(csv_path).name}: {e}")
+            return log.getvalue(), None
+    file_summary = {
+        'file': results['file'],
+        'passed': results['summary']['is_batch_passed']
+    }
+    return log.getvalue(), file_summary
+
+
+def process_auto_mode(summary_only: bool = False):
     """Process files in input_source folder automatically"""
     print("="*60)
     print("WADEPS DATA VALIDATOR - AUTO MODE")
@@ -898,7 +1216,9 @@ def process_auto_mode():
         print(f"Created '{output_folder}' folder for results")
     
 #find_csv_files
-    csv_files = list(input_folder.glob("*.csv"))
+    with os.scandir(input_folder) as entries:
+        csv_files = [e for e in entries
+                     if e.is_file() and e.name.lower().endswith('.csv')]
     
     if not csv_files:
         print(f"No CSV files found in '{input_folder}' folder")
@@ -918,14 +1238,11 @@ def process_auto_mode():
             print("Please ensure the wadeps_uof_template.json file is in the templates directory")
             return
 
-        with open(template_json, 'r') as f:
-            data = json.load(f)
-            validator.headers = data['headers']
-            validator.validations = data['validations']
-            validator.template_path = str(template_json)
-            validator._load_registers()
-            print(f"Loaded template with {len(validator.headers)} headers, "
-                  f"{len(validator.validations)} validation rules\n")
+        template_bytes = template_json.read_bytes()
+        validator.template_path = str(template_json)
+        validator._apply_template(json.loads(template_bytes))
+        print(f"Loaded template with {len(validator.headers)} headers, "
+              f"{len(validator.validations)} validation rules\n")
     
     except FileNotFoundError:
         print("Template file not found at '../templates/template_data.json'!")
@@ -936,39 +1253,38 @@ def process_auto_mode():
         return
     
 #process_each_csv_file
-    all_results = []
-    for csv_file in csv_files:
-        try:
-            print(f"{'='*40}")
-            results = validator.validate_csv(csv_file)
-            
-#save_individual_results
-            output_path = output_folder / f"{csv_file.stem}_validation.json"
-            validator.save_validation_results(results, str(output_path))
-            
-#generate_dashboard
-            dashboard_path = validator.generate_dashboard(results)
-            
+    files_processed = []
+    total_passed = 0
+    max_workers = min(len(csv_files), os.cpu_count() or 1)
+    if sys.platform == 'win32':
+        max_workers = min(max_workers, _MAX_WINDOWS_WORKERS)
+    with ProcessPoolExecutor(max_workers=max_workers, initializer=_init_worker,
+                             initargs=(template_bytes, str(template_json))) as executor:
+        futures = [executor.submit(_process_one, csv_file.path, str(output_folder), summary_only)
+                   for csv_file in csv_files]
+
 #print_detailed_results
-            validator.print_detailed_results(results)
-            
-            all_results.append(results)
-            
-        except Exception as e:
-            print(f"  Error processing {csv_file.name}: {e}")
-            continue
+        for csv_file, future in zip(csv_files, futures):
+            print(f"{'='*40}")
+            try:
+                log, file_summary = future.result()
+            except Exception as e:
+                print(f"  Error processing {csv_file.name}: {e}")
+                continue
+            sys.stdout.write(log)
+            if file_summary is None:
+                continue
+            files_processed.append(file_summary['file'])
+            total_passed += file_summary['passed']
     
 #print_overall_summary
     print(f"\n{'='*60}")
     print("VALIDATION COMPLETE")
     print(f"{'='*60}")
-    print(f"Processed {len(all_results)} file(s)")
+    print(f"Processed {len(files_processed)} file(s)")
     
 #count_overall_stats
-    total_passed = sum(1 for r in all_results 
-                      if r['header_validation']['is_valid'] 
-                      and len(r['data_validation']['errors']) == 0)
-    total_failed = len(all_results) - total_passed
+    total_failed = len(files_processed) - total_passed
     
     if total_passed > 0:
         print(f"{total_passed} file(s) passed validation")
@@ -979,21 +1295,21 @@ def process_auto_mode():
     print(f"Check individual JSON files and HTML dashboards for detailed validation reports")
     
 #create_summary_report
+    now = datetime.now()
     summary = {
-        'validation_run': datetime.now().isoformat(),
-        'total_files': len(all_results),
+        'validation_run': now.isoformat(),
+        'total_files': len(files_processed),
         'passed': total_passed,
         'failed': total_failed,
-        'files_processed': [r['file'] for r in all_results],
+        'files_processed': files_processed,
         'template_info': {
             'headers': len(validator.headers),
             'validation_rules': len(validator.validations)
         }
     }
     
-    summary_path = output_folder / f"validation_summary_{datetime.now().strftime('%Y%m%d_%H%M%S')}.json"
-    with open(summary_path, 'w') as f:
-        json.dump(summary, f, indent=2)
+    summary_path = output_folder / f"validation_summary_{now.strftime('%Y%m%d_%H%M%S')}.json"
+    _write_json(summary_path, summary, pretty=True)
     
     print(f"\nSummary report: {summary_path}")
     
@@ -1031,7 +1347,7 @@ def main():
         return
     
 #default_auto_mode
-    process_auto_mode()
+    process_auto_mode(summary_only=args.summary_only)
 
 
 if __name__ == "__main__":